@@ -1,68 +1,262 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, send_from_directory
+from flask_compress import Compress
 import pandas as pd
+import numpy as np
+import polars as pl
+from numba import njit
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
 import os
+import re
+import hashlib
+import threading
+import multiprocessing
+import asyncio
 import json
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from werkzeug.http import http_date
 
 app = Flask(__name__, static_folder='static')
 
+# Compress responses (schedules are large and very repetitive), preferring Brotli
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 500
+Compress(app)
+
 # File paths
-TASKS_FILE = 'data/tasks.csv'
-FREE_TIME_FILE = 'data/free_time.csv'
+TASKS_FILE = 'data/tasks.parquet'
+FREE_TIME_FILE = 'data/free_time.parquet'
+
+# Tags marking tasks that are allowed to run longer than 6 hours
+_TAG_RE = re.compile(r'\[(?:MULTI-SESSION|FIXED EVENT|PENDING PLANNING)\]')
+
+# Worker processes for running the scheduler off the request thread. The pool is
+# created on first use with the spawn start method, since forking after gunicorn/asyncio
+# threads exist can deadlock. Each child imports pandas, Polars, pyarrow and Numba on its
+# own, so the pool stays small by default rather than following the CPU count, which
+# inside a container reports the host's CPUs instead of its quota
+SCHEDULER_WORKERS = max(1, int(os.environ.get('SCHEDULER_WORKERS', 1)))
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+def _get_pool():
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(max_workers=SCHEDULER_WORKERS,
+                                        mp_context=multiprocessing.get_context('spawn'))
+        return _POOL
+
+def _discard_pool(pool):
+    global _POOL
+    with _POOL_LOCK:
+        # Another request may already have replaced it
+        if _POOL is pool:
+            _POOL = None
+    pool.shutdown(wait=False)
+
+async def _run_in_pool(fn, *args):
+    # A worker that dies (OOM kill, crash in native code) breaks the whole pool, so
+    # replace it and retry once instead of failing every later request
+    for attempt in range(2):
+        pool = _get_pool()
+        try:
+            return await asyncio.wrap_future(pool.submit(fn, *args))
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            if attempt:
+                raise
+
+# Recent scheduler results keyed by a hash of their input, least recently used first
+SCHEDULE_CACHE_SIZE = 32
+_SCHEDULE_CACHE = OrderedDict()
+_SCHEDULE_CACHE_LOCK = threading.Lock()
+
+# Loaded DataFrames keyed by file path, reused while the file's mtime is unchanged
+_CACHE = {}
 
 # Helper functions to load/save data
 def load_data(file_path, default_columns):
     if os.path.exists(file_path):
-        return pd.read_csv(file_path)
+        mtime = os.stat(file_path).st_mtime_ns
+        cached = _CACHE.get(file_path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, pq.read_table(file_path).to_pandas())
+            _CACHE[file_path] = cached
+        # Callers modify the frame in place, so never hand out the cached one
+        return cached[1].copy()
+    
+    # Migrate data saved by older versions as CSV
+    legacy_path = os.path.splitext(file_path)[0] + '.csv'
+    if os.path.exists(legacy_path):
+        df = pd.read_csv(legacy_path)
     else:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
         df = pd.DataFrame(columns=default_columns)
-        df.to_csv(file_path, index=False)
-        return df
+    save_data(df, file_path)
+    return _CACHE[file_path][1].copy()
+
+# Columns the app treats as numbers or text. Request JSON can mix types in one column
+# (e.g. "3" and 5), which Arrow refuses to write, so they are coerced before saving
+NUMERIC_COLUMNS = ['Estimated Time', 'Importance', 'Complexity', 'Available Hours', 'Focus Sessions', 'Session Length']
+TEXT_COLUMNS = ['Project', 'Task', 'Due Date', 'Date', 'Event Type']
+
+def _normalize_columns(df):
+    df = df.copy(deep=False)
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    for col in TEXT_COLUMNS:
+        if col in df.columns:
+            # Keep missing values missing rather than turning them into "None"
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+# Store repeated project names as categories and the 1-5 ratings as small ints,
+# which Parquet keeps so every load gets them back without converting again
+def _compact_dtypes(df):
+    df = df.copy(deep=False)
+    if 'Project' in df.columns:
+        df['Project'] = df['Project'].astype('category')
+    for col in ['Importance', 'Complexity']:
+        if col in df.columns and pd.api.types.is_numeric_dtype(df[col]):
+            # Only downcasts when every value is a whole number, so missing ratings stay NaN
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
 
 def save_data(df, file_path):
     # Ensure directory exists
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    df.to_csv(file_path, index=False)
+    table = pa.Table.from_pandas(_compact_dtypes(_normalize_columns(df)), preserve_index=False)
+    # Write to a temp file and swap it in, so other workers never see a half-written
+    # file and the mtime we cache belongs to the file we wrote
+    tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        pq.write_table(table, tmp_path)
+        mtime = os.stat(tmp_path).st_mtime_ns
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    # Cache what a fresh read would return so the next load skips the disk
+    _CACHE[file_path] = (mtime, table.to_pandas())
+
+# Serialize API responses with orjson, which handles numpy scalars and turns NaN into null
+def _json_default(obj):
+    # Keep the HTTP date format jsonify used for datetimes (e.g. pandas Timestamps)
+    if isinstance(obj, datetime):
+        return http_date(obj)
+    raise TypeError
+
+def json_response(obj):
+    body = orjson.dumps(
+        obj,
+        default=_json_default,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+    return Response(body, mimetype='application/json')
+
+# Sentinel for a missing due date once dates are viewed as int64 day numbers
+NO_DUE_DATE = np.iinfo(np.int64).min
+
+# Fill free time windows (sorted by date) with tasks in priority order, best fit
+# first and earliest windows otherwise. free_hours is updated in place; returns
+# the task index, window index and hours of every allocation, plus the hours
+# each task still has left unscheduled.
+@njit(cache=True)
+def _allocate(task_times, task_due, free_dates, free_hours):
+    # Each allocation either finishes a task or empties a window
+    max_allocations = len(task_times) + len(free_hours)
+    out_task_idx = np.empty(max_allocations, dtype=np.int64)
+    out_free_idx = np.empty(max_allocations, dtype=np.int64)
+    out_alloc = np.empty(max_allocations, dtype=np.float64)
+    task_remaining = task_times.copy()
+    n = 0
+    # Windows are only ever drained, so once the leading windows run out of
+    # hours they stay empty for every later task and can be skipped for good
+    first_free = 0
+
+    for i in range(len(task_times)):
+        while first_free < len(free_hours) and not free_hours[first_free] > 0:
+            first_free += 1
+
+        # Only windows up to the due date are usable
+        if task_due[i] == NO_DUE_DATE:
+            cutoff = len(free_dates)
+        else:
+            cutoff = np.searchsorted(free_dates, task_due[i], side='right')
+
+        # Best fit: put the whole task in the usable window with the least room
+        # to spare, leaving bigger windows open for the tasks that follow
+        best = -1
+        if task_remaining[i] > 0:
+            for j in range(first_free, cutoff):
+                if free_hours[j] >= task_remaining[i] and (best < 0 or free_hours[j] < free_hours[best]):
+                    best = j
+
+        # If no single window fits, split it across the earliest windows instead
+        if best >= 0:
+            start, stop = best, best + 1
+        else:
+            start, stop = first_free, cutoff
+
+        for j in range(start, stop):
+            if task_remaining[i] <= 0:
+                break
+
+            if free_hours[j] > 0:
+                allocated_time = min(task_remaining[i], free_hours[j])
+                out_task_idx[n] = i
+                out_free_idx[n] = j
+                out_alloc[n] = allocated_time
+                n += 1
+                free_hours[j] -= allocated_time
+                task_remaining[i] -= allocated_time
+
+    return out_task_idx[:n], out_free_idx[:n], out_alloc[:n], task_remaining
 
 # API Routes
 @app.route('/')
 def index():
     return send_from_directory('static', 'index.html')
 
+# The file-backed routes below run their Parquet I/O on a worker thread via
+# asyncio.to_thread; with gunicorn's gthread workers (render.yaml) the other
+# request threads keep serving in the meantime
 # Get all tasks
 @app.route('/api/tasks', methods=['GET'])
-def get_tasks():
-    tasks_df = load_data(TASKS_FILE, ['Project', 'Task', 'Estimated Time', 'Due Date', 'Importance', 'Complexity'])
-    return jsonify(tasks_df.to_dict(orient='records'))
+async def get_tasks():
+    tasks_df = await asyncio.to_thread(load_data, TASKS_FILE, ['Project', 'Task', 'Estimated Time', 'Due Date', 'Importance', 'Complexity'])
+    return json_response(tasks_df.to_dict(orient='records'))
 
 # Save tasks
 @app.route('/api/tasks', methods=['POST'])
-def save_tasks():
+async def save_tasks():
     tasks = request.json
     tasks_df = pd.DataFrame(tasks)
-    save_data(tasks_df, TASKS_FILE)
-    return jsonify({"status": "success"})
+    await asyncio.to_thread(save_data, tasks_df, TASKS_FILE)
+    return json_response({"status": "success"})
 
 # Get all free time slots
 @app.route('/api/free-time', methods=['GET'])
-def get_free_time():
-    free_time_df = load_data(FREE_TIME_FILE, ['Date', 'Available Hours'])
-    return jsonify(free_time_df.to_dict(orient='records'))
+async def get_free_time():
+    free_time_df = await asyncio.to_thread(load_data, FREE_TIME_FILE, ['Date', 'Available Hours'])
+    return json_response(free_time_df.to_dict(orient='records'))
 
 # Save free time slots
 @app.route('/api/free-time', methods=['POST'])
-def save_free_time():
+async def save_free_time():
     free_time = request.json
     free_time_df = pd.DataFrame(free_time)
-    save_data(free_time_df, FREE_TIME_FILE)
-    return jsonify({"status": "success"})
+    await asyncio.to_thread(save_data, free_time_df, FREE_TIME_FILE)
+    return json_response({"status": "success"})
 
-# Run scheduler
-@app.route('/api/run-scheduler', methods=['POST'])
-def run_scheduler():
-    data = request.json
+# Scheduling logic, kept free of Flask so it can run in a worker process
+def _build_schedule(data):
     tasks_df = pd.DataFrame(data.get('tasks', []))
     free_time_df = pd.DataFrame(data.get('freeTime', []))
     
@@ -80,129 +274,173 @@ def run_scheduler():
     
     # Exit early if no tasks or free time
     if tasks_df.empty or free_time_df.empty:
-        return jsonify({
+        return {
             'scheduledTasks': [],
             'warnings': ["No tasks or free time available for scheduling."],
             'largeTasks': []
-        })
+        }
     
     # Basic scheduling logic
-    working_free_time_df = free_time_df.copy()
-    working_free_time_df = working_free_time_df.sort_values(by='Date')
+    # Free time is only needed as date-sorted arrays, not a working copy of the frame.
+    # Windows without a date can't be scheduled into
+    free_dates = free_time_df['Date'].to_numpy().astype('datetime64[D]')
+    order = np.flatnonzero(~np.isnat(free_dates))
+    order = order[np.argsort(free_dates[order], kind='stable')]
+    free_dates = free_dates[order]
+    free_hours = free_time_df['Available Hours'].to_numpy(dtype=np.float64)[order]
+
+    # Sorting and prioritizing tasks run as Polars expressions. Only the columns it sorts
+    # on go to Polars; task names can mix types, so they're picked up by row index later
+    task_columns = [col for col in ['Estimated Time', 'Due Date', 'Importance', 'Complexity'] if col in tasks_df.columns]
+    tasks_pl = pl.from_pandas(tasks_df[task_columns]).with_row_index('Row')
     
-    total_free_time = working_free_time_df['Available Hours'].sum()
-    total_task_time = tasks_df['Estimated Time'].sum() if 'Estimated Time' in tasks_df.columns else 0
+    total_free_time = np.nansum(free_hours)
+    total_task_time = tasks_pl['Estimated Time'].sum() if 'Estimated Time' in tasks_pl.columns else 0
     
     # Check for large tasks
-    for idx, task in tasks_df.iterrows():
-        # Skip if necessary columns don't exist
-        if 'Estimated Time' not in task or 'Task' not in task:
-            continue
-            
-        task_time = task['Estimated Time']
-        task_name = task['Task']
+    # Skip if necessary columns don't exist
+    if 'Estimated Time' in tasks_df.columns and 'Task' in tasks_df.columns:
+        is_tagged = tasks_df['Task'].astype(str).str.contains(_TAG_RE)
+        large_df = tasks_df[(tasks_df['Estimated Time'] > 6) & ~is_tagged]
+        if 'Due Date' in large_df.columns:
+            large_due_dates = large_df['Due Date']
+        else:
+            large_due_dates = [None] * len(large_df)
         
-        # Check if it's a large task
-        if task_time > 6 and not any(tag in str(task_name) for tag in ['[MULTI-SESSION]', '[FIXED EVENT]', '[PENDING PLANNING]']):
-            large_tasks.append({
+        large_tasks = [
+            {
                 'id': idx,
                 'Task': task_name,
                 'Estimated Time': task_time,
-                'Due Date': task['Due Date'] if 'Due Date' in task and pd.notnull(task['Due Date']) else None
-            })
-            
-            warnings.append(f"Task '{task_name}' exceeds 6 hours and should probably be split unless it's a Work Block.")
+                'Due Date': due_date if pd.notnull(due_date) else None
+            }
+            for idx, task_name, task_time, due_date in zip(
+                large_df.index, large_df['Task'], large_df['Estimated Time'], large_due_dates
+            )
+        ]
+        warnings.extend(
+            f"Task '{task_name}' exceeds 6 hours and should probably be split unless it's a Work Block."
+            for task_name in large_df['Task']
+        )
     
     # Prioritize tasks
-    if not tasks_df.empty and 'Due Date' in tasks_df.columns and 'Importance' in tasks_df.columns:
-        today = pd.to_datetime(datetime.today().date())
-        
-        def calc_priority(row):
-            days_until_due = (row['Due Date'] - today).days if pd.notnull(row['Due Date']) else 9999
-            return days_until_due * 1 - row['Importance'] * 5
+    if 'Due Date' in tasks_pl.columns and 'Importance' in tasks_pl.columns:
+        today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        # Tasks without a due date get pushed to the back of the queue
+        days_until_due = (pl.col('Due Date') - today).dt.total_days().fill_null(9999)
+        sort_by = ['Priority Score', 'Complexity']
+        descending = [False, False]
+        # Among equally urgent tasks, place the biggest first while there's the most room
+        if 'Estimated Time' in tasks_pl.columns:
+            sort_by.append('Estimated Time')
+            descending.append(True)
         
-        tasks_df['Priority Score'] = tasks_df.apply(calc_priority, axis=1)
-        tasks_df = tasks_df.sort_values(by=['Priority Score', 'Complexity'])
+        tasks_pl = tasks_pl.with_columns(
+            (days_until_due - pl.col('Importance') * 5).alias('Priority Score')
+        ).sort(sort_by, descending=descending, nulls_last=True, maintain_order=True)
     
     # Allocate tasks to free time windows
-    for _, task in tasks_df.iterrows():
-        # Skip if necessary columns don't exist
-        if 'Estimated Time' not in task or 'Task' not in task:
-            continue
-            
-        task_time_remaining = task['Estimated Time']
-        task_name = task['Task']
-        due_date = task['Due Date'] if 'Due Date' in task else None
-        
-        for f_idx, window in working_free_time_df.iterrows():
-            if task_time_remaining <= 0:
-                break
-            
-            if pd.notnull(due_date) and window['Date'] > due_date:
-                break
-            
-            available_hours = window['Available Hours']
-            if available_hours > 0:
-                allocated_time = min(task_time_remaining, available_hours)
-                scheduled_tasks.append({
-                    'Task': task_name,
-                    'Date': window['Date'].strftime('%Y-%m-%d'),
-                    'Allocated Hours': allocated_time
-                })
-                working_free_time_df.at[f_idx, 'Available Hours'] -= allocated_time
-                task_time_remaining -= allocated_time
-        
+    # The hot loop works on plain NumPy arrays rather than DataFrame rows
+    # Skip if necessary columns don't exist
+    if 'Estimated Time' in tasks_pl.columns and 'Task' in tasks_df.columns:
+        task_names = tasks_df['Task'].to_numpy()[tasks_pl['Row'].to_numpy()]
+        task_times = tasks_pl['Estimated Time'].to_numpy().astype(np.float64)
+        if 'Due Date' in tasks_pl.columns:
+            task_due = tasks_pl['Due Date'].to_numpy().astype('datetime64[D]')
+        else:
+            task_due = np.full(len(tasks_pl), np.datetime64('NaT'), dtype='datetime64[D]')
+
+        # Dates go into the compiled loop as int64 day numbers
+        alloc_task, alloc_free, alloc_hours, task_remaining = _allocate(
+            task_times, task_due.view('i8'), free_dates.view('i8'), free_hours
+        )
+        free_date_strs = np.datetime_as_string(free_dates).tolist()
+        scheduled_tasks = [
+            {
+                'Task': task_names[i],
+                'Date': free_date_strs[j],
+                'Allocated Hours': allocated_time
+            }
+            for i, j, allocated_time in zip(alloc_task.tolist(), alloc_free.tolist(), alloc_hours.tolist())
+        ]
+
         # Check if we couldn't schedule everything before due date
-        if pd.notnull(due_date) and task_time_remaining > 0:
-            warnings.append(
-                f"HANDLE: {task_name} (Due: {due_date.strftime('%Y-%m-%d')}) "
-                f"needs {task['Estimated Time']}h, but only {task['Estimated Time'] - task_time_remaining}h scheduled before due date."
-            )
-    
+        unfinished = np.flatnonzero(~np.isnat(task_due) & (task_remaining > 0))
+        warnings.extend(
+            f"HANDLE: {task_names[i]} (Due: {task_due[i]}) "
+            f"needs {task_times[i]}h, but only {task_times[i] - task_remaining[i]}h scheduled before due date."
+            for i in unfinished
+        )
+
     # Calculate daily summary for the response
-    daily_summary = []
-    if not working_free_time_df.empty:
-        for date, group in working_free_time_df.groupby('Date'):
-            daily_summary.append({
-                'Date': date.strftime('%Y-%m-%d'),
-                'Total Available': group['Available Hours'].sum(),
-                'Total Scheduled': 0  # Will be updated below
-            })
+    # free_dates is sorted, so each day's windows form one contiguous run
+    summary_dates, day_starts = np.unique(free_dates, return_index=True)
+    day_totals = np.add.reduceat(np.nan_to_num(free_hours), day_starts) if len(free_hours) else free_hours
+    daily_summary = [
+        {
+            'Date': date,
+            'Total Available': total_available,
+            'Total Scheduled': 0  # Will be updated below
+        }
+        for date, total_available in zip(np.datetime_as_string(summary_dates).tolist(), day_totals.tolist())
+    ]
     
     # Update scheduled hours in daily summary
+    summary_by_date = {summary['Date']: summary for summary in daily_summary}
     for task in scheduled_tasks:
-        date = task['Date']
-        hours = task['Allocated Hours']
-        
-        for summary in daily_summary:
-            if summary['Date'] == date:
-                summary['Total Scheduled'] += hours
-                break
+        summary_by_date[task['Date']]['Total Scheduled'] += task['Allocated Hours']
     
     # Return the results
-    return jsonify({
+    return {
         'totalFreeTime': total_free_time,
         'totalTaskTime': total_task_time,
         'scheduledTasks': scheduled_tasks,
         'dailySummary': daily_summary,
         'warnings': warnings,
         'largeTasks': large_tasks
-    })
+    }
+
+# The schedule only depends on the request payload and (through priorities) today's date
+def _schedule_key(data):
+    payload = orjson.dumps([datetime.today().date().isoformat(), data], option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload).digest()
+
+# Run scheduler
+# Scheduling is CPU-bound, so it runs in the process pool instead of the request thread
+@app.route('/api/run-scheduler', methods=['POST'])
+async def run_scheduler():
+    data = request.json
+    key = _schedule_key(data)
+    
+    with _SCHEDULE_CACHE_LOCK:
+        result = _SCHEDULE_CACHE.get(key)
+        if result is not None:
+            _SCHEDULE_CACHE.move_to_end(key)
+    
+    if result is None:
+        result = await _run_in_pool(_build_schedule, data)
+        with _SCHEDULE_CACHE_LOCK:
+            _SCHEDULE_CACHE[key] = result
+            if len(_SCHEDULE_CACHE) > SCHEDULE_CACHE_SIZE:
+                _SCHEDULE_CACHE.popitem(last=False)
+    
+    return json_response(result)
 
 # Task breakdown endpoint
 @app.route('/api/breakdown-task', methods=['POST'])
-def breakdown_task():
+async def breakdown_task():
     data = request.json
     task_id = int(data.get('taskId'))  # Convert to int as it comes as string from frontend
     approach = data.get('approach')
     params = data.get('params', {})
     
     # Load current tasks
-    tasks_df = load_data(TASKS_FILE, ['Project', 'Task', 'Estimated Time', 'Due Date', 'Importance', 'Complexity'])
+    tasks_df = await asyncio.to_thread(load_data, TASKS_FILE, ['Project', 'Task', 'Estimated Time', 'Due Date', 'Importance', 'Complexity'])
     
     # Check if task exists
     if task_id >= len(tasks_df):
-        return jsonify({"status": "error", "message": "Task not found"}), 404
+        return json_response({"status": "error", "message": "Task not found"}), 404
     
     # Get the task
     task = tasks_df.iloc[task_id]
@@ -217,27 +455,29 @@ def breakdown_task():
         planning_hours = params.get('hours', 1.0)
         
         # Create new planning task
-        new_task = pd.DataFrame({
-            'Project': [task['Project'] if 'Project' in task else "Planning"],
-            'Task': [planning_task_name],
-            'Estimated Time': [planning_hours],
-            'Due Date': [planning_date],
-            'Importance': [4],  # High importance
-            'Complexity': [2]   # Moderate complexity
-        })
+        new_task = {
+            'Project': task['Project'] if 'Project' in task else "Planning",
+            'Task': planning_task_name,
+            'Estimated Time': planning_hours,
+            'Due Date': planning_date,
+            'Importance': 4,  # High importance
+            'Complexity': 2   # Moderate complexity
+        }
         
         # Update original task
-        tasks_df.at[task_id, 'Task'] = f"{task_name} [PENDING PLANNING]"
+        records = tasks_df.to_dict(orient='records')
+        records[task_id]['Task'] = f"{task_name} [PENDING PLANNING]"
         
         # Add new task
-        tasks_df = pd.concat([tasks_df, new_task], ignore_index=True)
+        records.append(new_task)
+        tasks_df = pd.DataFrame.from_records(records)
         
     elif approach == "breakdown":
         # Break into subtasks
         subtasks = params.get('subtasks', [])
         
         if not subtasks:
-            return jsonify({"status": "error", "message": "No subtasks provided"}), 400
+            return json_response({"status": "error", "message": "No subtasks provided"}), 400
         
         # Create new subtasks
         new_tasks = []
@@ -248,11 +488,12 @@ def breakdown_task():
             new_tasks.append(new_task)
         
         # Remove original task
-        tasks_df = tasks_df.drop(task_id)
+        records = tasks_df.to_dict(orient='records')
+        records.pop(task_id)
         
         # Add new tasks
-        new_tasks_df = pd.DataFrame(new_tasks)
-        tasks_df = pd.concat([tasks_df, new_tasks_df], ignore_index=True)
+        records.extend(new_tasks)
+        tasks_df = pd.DataFrame.from_records(records)
         
     elif approach == "focus":
         # Split into focus sessions
@@ -291,12 +532,12 @@ def breakdown_task():
         remaining_task['Estimated Time'] = hours - exploration_hours
         
         # Remove original task
-        tasks_df = tasks_df.drop(task_id)
+        records = tasks_df.to_dict(orient='records')
+        records.pop(task_id)
         
         # Add new tasks
-        exploration_df = pd.DataFrame([exploration_task])
-        remaining_df = pd.DataFrame([remaining_task])
-        tasks_df = pd.concat([tasks_df, exploration_df, remaining_df], ignore_index=True)
+        records.extend([exploration_task, remaining_task])
+        tasks_df = pd.DataFrame.from_records(records)
         
     elif approach == "fixed":
         # Mark as fixed event
@@ -314,12 +555,12 @@ def breakdown_task():
         tasks_df.at[task_id, 'Event Type'] = "Fixed Duration"
     
     else:
-        return jsonify({"status": "error", "message": "Invalid approach"}), 400
+        return json_response({"status": "error", "message": "Invalid approach"}), 400
     
     # Save updated tasks
-    save_data(tasks_df, TASKS_FILE)
+    await asyncio.to_thread(save_data, tasks_df, TASKS_FILE)
     
-    return jsonify({"status": "success"})
+    return json_response({"status": "success"})
 
 if __name__ == '__main__':
     # Use the PORT environment variable provided by Render
@@ -0,0 +1,66 @@
+import numpy as np
+
+from app import NO_DUE_DATE, _allocate
+
+
+def days(*dates):
+    return np.array(dates, dtype='datetime64[D]').view('i8')
+
+
+def allocate(task_times, task_due, free_dates, free_hours):
+    free_hours = np.array(free_hours, dtype=np.float64)
+    task_idx, free_idx, hours, remaining = _allocate(
+        np.array(task_times, dtype=np.float64), np.array(task_due, dtype=np.int64), free_dates, free_hours
+    )
+    allocations = list(zip(task_idx.tolist(), free_idx.tolist(), hours.tolist()))
+    return allocations, remaining.tolist(), free_hours.tolist()
+
+
+def test_best_fit_picks_tightest_window_that_holds_whole_task():
+    free_dates = days('2030-01-01', '2030-01-02', '2030-01-03')
+    allocations, remaining, free_hours = allocate([2.0], [NO_DUE_DATE], free_dates, [3.0, 2.0, 5.0])
+    assert allocations == [(0, 1, 2.0)]
+    assert remaining == [0.0]
+    assert free_hours == [3.0, 0.0, 5.0]
+
+
+def test_best_fit_ties_go_to_earliest_window():
+    free_dates = days('2030-01-01', '2030-01-02')
+    allocations, _, _ = allocate([1.0, 1.0], [NO_DUE_DATE, NO_DUE_DATE], free_dates, [1.0, 1.0])
+    assert allocations == [(0, 0, 1.0), (1, 1, 1.0)]
+
+
+def test_splits_across_earliest_windows_when_nothing_fits():
+    free_dates = days('2030-01-01', '2030-01-02', '2030-01-03')
+    allocations, remaining, free_hours = allocate([5.0], [NO_DUE_DATE], free_dates, [2.0, 2.0, 4.0])
+    assert allocations == [(0, 0, 2.0), (0, 1, 2.0), (0, 2, 1.0)]
+    assert remaining == [0.0]
+    assert free_hours == [0.0, 0.0, 3.0]
+
+
+def test_windows_after_due_date_are_not_used():
+    free_dates = days('2030-01-01', '2030-01-02', '2030-01-03')
+    due = days('2030-01-02')[0]
+    allocations, remaining, free_hours = allocate([5.0], [due], free_dates, [1.0, 1.0, 10.0])
+    assert allocations == [(0, 0, 1.0), (0, 1, 1.0)]
+    assert remaining == [3.0]
+    assert free_hours == [0.0, 0.0, 10.0]
+
+
+def test_exhausted_leading_windows_are_skipped():
+    free_dates = days('2030-01-01', '2030-01-02', '2030-01-03')
+    allocations, remaining, free_hours = allocate(
+        [2.0, 1.0, 1.0], [NO_DUE_DATE] * 3, free_dates, [0.0, 2.0, 2.0]
+    )
+    # Nothing is ever booked into an empty window, and later tasks still find the room left
+    assert allocations == [(0, 1, 2.0), (1, 2, 1.0), (2, 2, 1.0)]
+    assert remaining == [0.0, 0.0, 0.0]
+    assert free_hours == [0.0, 0.0, 0.0]
+
+
+def test_zero_hour_task_gets_no_allocation():
+    free_dates = days('2030-01-01')
+    allocations, remaining, free_hours = allocate([0.0], [NO_DUE_DATE], free_dates, [3.0])
+    assert allocations == []
+    assert remaining == [0.0]
+    assert free_hours == [3.0]